@@ -1,6 +1,7 @@
 """Jupyter notebook application."""
 from __future__ import annotations
 
+import functools
 import os
 import re
 import typing as t
@@ -31,18 +32,70 @@ from jupyterlab_server.config import (
 from jupyterlab_server.handlers import _camelCase, is_url
 from notebook_shim.shim import NotebookConfigShimMixin
 from tornado import web
-from traitlets import Bool, Unicode, default
+from tornado.ioloop import IOLoop
+from traitlets import Bool, Instance, Unicode, default
 from traitlets.config.loader import Config
 
 from ._version import __version__
 
-HERE = Path(__file__).parent.resolve()
+HERE = Path(__file__).absolute().parent
 
 Flags = t.Dict[t.Union[str, t.Tuple[str, ...]], t.Tuple[t.Union[t.Dict[str, t.Any], Config], str]]
 
-app_dir = Path(get_app_dir())
 version = __version__
 
+# Resolving the app dir touches the environment and the filesystem, so it is
+# deferred until an app needs it and then shared across instances.
+_cached_get_app_dir = functools.lru_cache(None)(get_app_dir)
+
+
+def __getattr__(name: str) -> t.Any:
+    # Keep the module-level ``app_dir`` available without computing it at import.
+    if name == "app_dir":
+        return Path(_cached_get_app_dir())
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+_JUPYTER_CONFIG_DIR = jupyter_config_dir()
+_CUSTOM_CSS_PATH = f"{_JUPYTER_CONFIG_DIR}/custom/custom.css"
+
+# LabConfig only declares traits, so its names can be read off the class
+# without paying for an instance.
+_LAB_TRAIT_NAMES = tuple(LabConfig.class_traits())
+# Page config keys for the traits and for the full versions of the URL traits.
+_CAMEL = {name: _camelCase(name) for name in _LAB_TRAIT_NAMES}
+_CAMEL_FULL = {
+    name: _camelCase("full_" + name) for name in _LAB_TRAIT_NAMES if name.endswith("_url")
+}
+
+_STATIC_PREFIX_RE = re.compile(r"^(.*?)static")
+
+
+def _resolve_url(base_url: str, url: str) -> str:
+    """Prefix relative URLs with ``base_url``."""
+    return url if is_url(url) else ujoin(base_url, url)
+
+
+def _normalize_server_root(server_root: str) -> str:
+    """Normalize the server root the way it is compared against ``preferred_dir``."""
+    return os.path.normpath(Path(server_root.replace(os.sep, "/")).expanduser())
+
+
+def _flat_apply(dst: dict[str, t.Any], src: dict[str, t.Any]) -> None:
+    """Merge ``src`` into ``dst`` with the semantics of ``recursive_update``.
+
+    Scalars and lists are assigned directly and ``None`` values remove the key;
+    only dict values go through ``recursive_update``. ``get_page_config``
+    currently returns no top-level dicts, so in practice this is a flat update.
+    """
+    for key, value in src.items():
+        if isinstance(value, dict):
+            recursive_update(dst, {key: value})
+        elif value is None:
+            dst.pop(key, None)
+        else:
+            dst[key] = value
+
 
 class NotebookBaseHandler(ExtensionHandlerJinjaMixin, ExtensionHandlerMixin, JupyterHandler):
     """Base handler for notebook-related pages."""
@@ -53,69 +106,86 @@ class NotebookBaseHandler(ExtensionHandlerJinjaMixin, ExtensionHandlerMixin, Jup
 
     def get_page_config(self) -> dict[str, t.Any]:
         """Generate page configuration for the frontend."""
-        config = LabConfig()
+        settings = self.settings
         app: JupyterNotebookApp = self.extensionapp  # type: ignore[assignment]
-        base_url = self.settings.get("base_url", "/")
-        page_config_data = self.settings.setdefault("page_config_data", {})
+        page_config_data = settings.setdefault("page_config_data", {})
+
+        raw_server_root = settings.get("server_root_dir", "")
+        cached_root = app._cached_server_root
+        if cached_root is not None and cached_root[0] == raw_server_root:
+            server_root = cached_root[1]
+        else:
+            server_root = _normalize_server_root(raw_server_root)
+            app._cached_server_root = (raw_server_root, server_root)
+        try:
+            preferred_dir = self.serverapp.preferred_dir
+            cached = app._cached_preferred_path
+            if cached is not None and cached[0] == preferred_dir and cached[1] == server_root:
+                preferred_path = cached[2]
+            else:
+                preferred_path = "/" + os.path.relpath(preferred_dir, server_root) \
+                    if preferred_dir != server_root else "/"
+                app._cached_preferred_path = (preferred_dir, server_root, preferred_path)
+        except Exception as e:
+            self.log.error(f"Error determining preferred path: {e}")
+            preferred_path = "/"
+
         page_config = {
             **page_config_data,
-            "appVersion": version,
-            "baseUrl": self.base_url,
-            "terminalsAvailable": self.settings.get("terminals_available", False),
-            "token": self.settings["token"],
-            "fullStaticUrl": ujoin(self.base_url, "static", self.name),
-            "frontendUrl": ujoin(self.base_url, "/"),
-            "exposeAppInBrowser": app.expose_app_in_browser,
+            **self._get_static_page_config(app),
+            "baseUrl": settings.get("base_url", "/"),
+            "terminalsAvailable": settings.get("terminals_available", False),
+            "token": settings["token"],
+            "preferredPath": preferred_path,
         }
+        # Extension metadata and labconfig page_config.json may change at any time
+        # (e.g. `jupyter labextension disable`), so they are read on every request.
+        labextensions_path = app.extra_labextensions_path + app.labextensions_path
+        _flat_apply(page_config, get_page_config(labextensions_path, logger=self.log))
 
-        server_root = self.settings.get("server_root_dir", "").replace(os.sep, "/")
-        server_root = os.path.normpath(Path(server_root).expanduser())
-        try:
-            page_config["preferredPath"] = "/" + os.path.relpath(self.serverapp.preferred_dir, server_root) \
-                if self.serverapp.preferred_dir != server_root else "/"
-        except Exception as e:
-            self.log.error(f"Error determining preferred path: {e}")
-            page_config["preferredPath"] = "/"
+        page_config_hook = settings.get("page_config_hook")
+        if page_config_hook:
+            page_config = page_config_hook(self, page_config)
 
-        mathjax_config = self.settings.get("mathjax_config", "TeX-AMS_HTML-full,Safe")
-        mathjax_url = self.settings.get(
+        return page_config
+
+    def _get_static_page_config(self, app: JupyterNotebookApp) -> dict[str, t.Any]:
+        """Return the request-invariant parts of the page config.
+
+        The result is cached on the app and rebuilt when the base URL or the
+        MathJax settings change.
+        """
+        settings = self.settings
+        base_url = settings.get("base_url", "/")
+        mathjax_config = settings.get("mathjax_config", "TeX-AMS_HTML-full,Safe")
+        mathjax_url = settings.get(
             "mathjax_url",
             "https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.7/MathJax.js",
         )
-        if not url_is_absolute(mathjax_url) and not mathjax_url.startswith(self.base_url):
-            mathjax_url = ujoin(self.base_url, mathjax_url)
+        cache_key = (base_url, mathjax_config, mathjax_url)
+        if app._page_config_cache is not None and app._page_config_cache_key == cache_key:
+            return app._page_config_cache
 
-        page_config.update({
+        if not url_is_absolute(mathjax_url) and not mathjax_url.startswith(base_url):
+            mathjax_url = ujoin(base_url, mathjax_url)
+
+        static_page_config = {
+            "appVersion": version,
+            "fullStaticUrl": ujoin(base_url, "static", self.name),
+            "frontendUrl": ujoin(base_url, "/"),
+            "exposeAppInBrowser": app.expose_app_in_browser,
             "mathjaxConfig": mathjax_config,
             "fullMathjaxUrl": mathjax_url,
-            "jupyterConfigDir": jupyter_config_dir(),
+            "jupyterConfigDir": _JUPYTER_CONFIG_DIR,
+        }
+        static_page_config.update({key: getattr(app, name) for name, key in _CAMEL.items()})
+        static_page_config.update({
+            key: _resolve_url(base_url, getattr(app, name)) for name, key in _CAMEL_FULL.items()
         })
 
-        for name in config.trait_names():
-            page_config[_camelCase(name)] = getattr(app, name)
-
-        for name in config.trait_names():
-            if name.endswith("_url"):
-                full_name = _camelCase("full_" + name)
-                full_url = getattr(app, name)
-                if not is_url(full_url):
-                    full_url = ujoin(base_url, full_url)
-                page_config[full_name] = full_url
-
-        labextensions_path = app.extra_labextensions_path + app.labextensions_path
-        recursive_update(
-            page_config,
-            get_page_config(
-                labextensions_path,
-                logger=self.log,
-            ),
-        )
-
-        page_config_hook = self.settings.get("page_config_hook")
-        if page_config_hook:
-            page_config = page_config_hook(self, page_config)
-
-        return page_config
+        app._page_config_cache_key = cache_key
+        app._page_config_cache = static_page_config
+        return static_page_config
 
 
 class TreeHandler(NotebookBaseHandler):
@@ -127,8 +197,12 @@ class TreeHandler(NotebookBaseHandler):
         path = path.strip("/")
         cm = self.contents_manager
 
-        if await ensure_async(cm.dir_exists(path=path)):
-            if await ensure_async(cm.is_hidden(path)) and not cm.allow_hidden:
+        # A single lookup tells us whether the path exists and what it is;
+        # the contents manager raises a 404 for missing paths.
+        model = await ensure_async(cm.get(path, content=False))
+
+        if model["type"] == "directory":
+            if not cm.allow_hidden and await ensure_async(cm.is_hidden(path)):
                 self.log.info("Refusing to serve hidden directory, via 404 Error")
                 raise web.HTTPError(404)
 
@@ -137,16 +211,11 @@ class TreeHandler(NotebookBaseHandler):
             tpl = self.render_template("tree.html", page_config=page_config)
             return self.write(tpl)
 
-        if await ensure_async(cm.file_exists(path)):
-            model = await ensure_async(cm.get(path, content=False))
-            url = ujoin(self.base_url, "notebooks", url_escape(path)) \
-                if model["type"] == "notebook" \
-                else ujoin(self.base_url, "files", url_escape(path))
-            self.log.debug("Redirecting %s to %s", self.request.path, url)
-            self.redirect(url)
-            return None
-
-        raise web.HTTPError(404)
+        kind = "notebooks" if model["type"] == "notebook" else "files"
+        url = ujoin(self.base_url, kind, url_escape(path))
+        self.log.debug("Redirecting %s to %s", self.request.path, url)
+        self.redirect(url)
+        return None
 
 
 class ConsoleHandler(NotebookBaseHandler):
@@ -192,25 +261,58 @@ class NotebookHandler(NotebookBaseHandler):
 class CustomCssHandler(NotebookBaseHandler):
     """Handler for serving custom CSS."""
 
+    # Contents of served CSS files keyed by path, along with their (mtime_ns, size).
+    _css_cache: dict[str, tuple[tuple[int, int], bytes]] = {}
+
     @web.authenticated
-    def get(self) -> t.Any:
+    async def get(self) -> None:
         """Serve the custom CSS file."""
         self.set_header("Content-Type", "text/css")
-        page_config = self.get_page_config()
-        custom_css_file = f"{page_config['jupyterConfigDir']}/custom/custom.css"
-
-        if not Path(custom_css_file).is_file():
-            static_path_root = re.match("^(.*?)static", page_config["staticDir"])
-            if static_path_root:
-                custom_css_file = f"{static_path_root.groups()[0]}custom/custom.css"
+        app: JupyterNotebookApp = self.extensionapp  # type: ignore[assignment]
 
         try:
-            with Path(custom_css_file).open() as css_f:
-                return self.write(css_f.read())
+            data = await self._load_custom_css(app.static_dir)
         except IOError as e:
             self.log.error(f"Error reading custom CSS file: {e}")
             raise web.HTTPError(500, "Custom CSS file not found.")
 
+        self.write(data)
+
+    async def _load_custom_css(self, static_dir: str) -> bytes:
+        """Read the user's custom CSS, falling back to the one next to ``static_dir``."""
+        try:
+            return await self._read_css(_CUSTOM_CSS_PATH)
+        except FileNotFoundError:
+            static_path_root = _STATIC_PREFIX_RE.match(static_dir)
+            if static_path_root is None:
+                raise
+            return await self._read_css(f"{static_path_root.groups()[0]}custom/custom.css")
+
+    async def _read_css(self, path: str) -> bytes:
+        """Read ``path`` off the event loop, reusing the cached bytes if unchanged."""
+        io_loop = IOLoop.current()
+        st = await io_loop.run_in_executor(None, Path(path).stat)
+        # The size guards against edits within a coarse filesystem timestamp tick.
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._css_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        data = await io_loop.run_in_executor(None, Path(path).read_bytes)
+        self._css_cache[path] = (stamp, data)
+        return data
+
+
+# Built once at import so the route patterns are compiled a single time,
+# however many web applications are created.
+_HANDLERS = (
+    web.url(r"/tree/(.*)", TreeHandler),
+    web.url(r"/consoles/(.*)", ConsoleHandler),
+    web.url(r"/terminals/(.*)", TerminalHandler),
+    web.url(r"/files/(.*)", FileHandler),
+    web.url(r"/notebooks/(.*)", NotebookHandler),
+    web.url(r"/custom/custom.css", CustomCssHandler),
+)
 
 aliases = dict(base_aliases)
 
@@ -227,9 +329,17 @@ class JupyterNotebookApp(NotebookConfigShimMixin, LabServerApp):
     default_url = Unicode("/tree", config=True, help="The default URL to redirect to from `/`")
     file_url_prefix = "/tree"
     load_other_extensions = True
-    app_dir = app_dir
+    app_dir = Instance(Path, help="The JupyterLab application directory.")
     subcommands: dict[str, t.Any] = {}
 
+    # Request-invariant page config, see NotebookBaseHandler._get_static_page_config.
+    _page_config_cache: dict[str, t.Any] | None = None
+    _page_config_cache_key: tuple[str, str, str] | None = None
+    # (server_root_dir, normalized server root) from the last page config.
+    _cached_server_root: tuple[str, str] | None = None
+    # (preferred_dir, server_root, preferredPath) from the last page config.
+    _cached_preferred_path: tuple[str, str, str] | None = None
+
     expose_app_in_browser = Bool(
         False,
         config=True,
@@ -263,6 +373,11 @@ class JupyterNotebookApp(NotebookConfigShimMixin, LabServerApp):
             self.config_dir, "jupyter_notebook_config.py"
         )
 
+    @default("app_dir")
+    def _default_app_dir(self) -> Path:
+        """Default application directory."""
+        return Path(_cached_get_app_dir())
+
     @default("server_root_dir")
     def _default_server_root_dir(self) -> str:
         """Default server root directory."""
@@ -288,14 +403,7 @@ class JupyterNotebookApp(NotebookConfigShimMixin, LabServerApp):
     def create_webapp(self) -> web.Application:
         """Create the Tornado web application."""
         return web.Application(
-            [
-                (r"/tree/(.*)", TreeHandler),
-                (r"/consoles/(.*)", ConsoleHandler),
-                (r"/terminals/(.*)", TerminalHandler),
-                (r"/files/(.*)", FileHandler),
-                (r"/notebooks/(.*)", NotebookHandler),
-                (r"/custom/custom.css", CustomCssHandler),
-            ],
+            list(_HANDLERS),
             default_handler_class=web.ErrorHandler,
             default_handler_args=(404,),
             **self.web_app_config.settings,
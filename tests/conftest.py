@@ -42,8 +42,8 @@ def make_notebook_app(  # PLR0913
     workspaces_dir,
     labextensions_dir,
 ):
-    def _make_notebook_app(**kwargs):
-        return JupyterNotebookApp(
+    def _make_notebook_app(app_class=JupyterNotebookApp, **kwargs):
+        return app_class(
             static_dir=str(jp_root_dir),
             templates_dir=str(jp_template_dir),
             app_url="/",
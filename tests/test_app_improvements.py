@@ -0,0 +1,286 @@
+import copy
+import importlib.util
+import json
+import os
+import pathlib
+
+import pytest
+from tornado.httpclient import HTTPClientError
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+
+@pytest.fixture()
+def improvements(jp_environ):
+    # app_improvements.py lives next to the notebook package and uses a relative
+    # import, so load it as a submodule once the test environment is in place.
+    spec = importlib.util.spec_from_file_location(
+        "notebook.app_improvements", ROOT / "app_improvements.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture()
+def improvements_app(jp_serverapp, make_notebook_app, improvements):
+    app = make_notebook_app(app_class=improvements.JupyterNotebookApp)
+    app.handlers.extend(
+        [
+            ("/tree(.*)", improvements.TreeHandler),
+            ("/notebooks(.*)", improvements.NotebookHandler),
+            ("/custom/custom.css", improvements.CustomCssHandler),
+        ]
+    )
+    app._link_jupyter_server_extension(jp_serverapp)
+    # JupyterNotebookApp.initialize forwards argv, which ExtensionApp.initialize
+    # does not accept when linked to a running server.
+    super(improvements.JupyterNotebookApp, app).initialize()
+    return app
+
+
+@pytest.fixture()
+def notebooks(jp_create_notebook):
+    nbpaths = ("notebook1.ipynb", "jlab_test_notebooks/notebook2.ipynb")
+    for nb in nbpaths:
+        jp_create_notebook(nb)
+    return nbpaths
+
+
+def get_page_config(html):
+    start = html.index('<script id="jupyter-config-data" type="application/json">')
+    start = html.index(">", start) + 1
+    end = html.index("</script>", start)
+    return json.loads(html[start:end])
+
+
+def write_extension(labextensions_dir, load):
+    ext_dir = labextensions_dir / "test-extension"
+    ext_dir.mkdir(exist_ok=True)
+    data = {
+        "name": "test-extension",
+        "version": "1.0.0",
+        "jupyterlab": {"_build": {"load": load, "extension": "./extension"}},
+    }
+    (ext_dir / "package.json").write_text(json.dumps(data))
+
+
+async def test_page_config_reflects_extension_updates(
+    improvements_app, labextensions_dir, jp_fetch
+):
+    write_extension(labextensions_dir, "static/remoteEntry.v1.js")
+    r = await jp_fetch("notebooks", "foo")
+    extensions = get_page_config(r.body.decode())["federated_extensions"]
+    assert [ext["load"] for ext in extensions] == ["static/remoteEntry.v1.js"]
+
+    # Rewrite the package.json in place, as an upgrade of the extension would.
+    write_extension(labextensions_dir, "static/remoteEntry.v2.js")
+    r = await jp_fetch("notebooks", "foo")
+    extensions = get_page_config(r.body.decode())["federated_extensions"]
+    assert [ext["load"] for ext in extensions] == ["static/remoteEntry.v2.js"]
+
+
+async def test_page_config_reflects_labconfig_updates(
+    improvements_app, jp_env_config_path, jp_fetch
+):
+    r = await jp_fetch("notebooks", "foo")
+    assert get_page_config(r.body.decode())["disabledExtensions"] == []
+
+    labconfig = jp_env_config_path / "labconfig"
+    labconfig.mkdir(parents=True, exist_ok=True)
+    page_config = {"disabledExtensions": {"@jupyterlab/foo-extension": True}}
+    (labconfig / "page_config.json").write_text(json.dumps(page_config))
+
+    r = await jp_fetch("notebooks", "foo")
+    assert get_page_config(r.body.decode())["disabledExtensions"] == ["@jupyterlab/foo-extension"]
+
+
+def test_flat_apply_matches_recursive_update(improvements):
+    from jupyterlab_server.config import recursive_update
+
+    base = {"a": 1, "b": [1], "c": "x", "token": "secret"}
+    new = {"a": 2, "b": ["ext"], "c": None, "d": None, "federated_extensions": []}
+    expected = dict(base)
+    recursive_update(expected, new)
+
+    page_config = dict(base)
+    improvements._flat_apply(page_config, new)
+    assert page_config == expected
+
+    # Nested dicts are merged, with None removal and empty-subtree pruning.
+    base = {"hub": {"user": "a", "host": "h"}, "flag": True}
+    new = {"hub": {"user": "b", "host": None, "extra": {"x": 1}}, "empty": {"y": None}}
+    expected = copy.deepcopy(base)
+    recursive_update(expected, copy.deepcopy(new))
+
+    page_config = copy.deepcopy(base)
+    improvements._flat_apply(page_config, new)
+    assert page_config == expected
+    assert page_config["hub"] == {"user": "b", "extra": {"x": 1}}
+    assert "empty" not in page_config
+
+
+async def test_page_config_includes_lab_config(improvements_app, jp_fetch):
+    # The fixture links the app without JupyterNotebookApp.initialize, so the
+    # trait values must not depend on it.
+    r = await jp_fetch("notebooks", "foo")
+    page_config = get_page_config(r.body.decode())
+    assert page_config["staticDir"] == improvements_app.static_dir
+    assert page_config["appName"] == improvements_app.app_name
+    assert page_config["settingsUrl"] == improvements_app.settings_url
+    assert page_config["fullSettingsUrl"] == "/a%40b" + improvements_app.settings_url
+
+
+async def test_page_config_urls_follow_settings(improvements_app, jp_serverapp, jp_fetch):
+    settings = jp_serverapp.web_app.settings
+    r = await jp_fetch("notebooks", "foo")
+    page_config = get_page_config(r.body.decode())
+    assert page_config["fullStaticUrl"] == "/a%40b/static/notebook"
+    assert page_config["fullMathjaxUrl"].startswith("https://")
+    assert not [key for key in settings if key.startswith("_full")]
+
+    settings["mathjax_url"] = "static/mathjax/MathJax.js"
+    r = await jp_fetch("notebooks", "foo")
+    page_config = get_page_config(r.body.decode())
+    assert page_config["fullMathjaxUrl"] == "/a%40b/static/mathjax/MathJax.js"
+
+
+async def test_custom_css_handler(improvements_app, jp_config_dir, monkeypatch, jp_fetch):
+    custom_css = jp_config_dir / "custom" / "custom.css"
+    custom_css.parent.mkdir(parents=True)
+    custom_css.write_text("body { color: red; }")
+
+    reads = []
+    read_bytes = pathlib.Path.read_bytes
+
+    def counting_read_bytes(self):
+        reads.append(self)
+        return read_bytes(self)
+
+    monkeypatch.setattr(pathlib.Path, "read_bytes", counting_read_bytes)
+
+    r = await jp_fetch("custom", "custom.css")
+    assert r.code == 200
+    assert r.headers["Content-Type"] == "text/css"
+    assert r.body == b"body { color: red; }"
+    assert r.headers["Content-Length"] == str(len(r.body))
+    assert len(reads) == 1
+
+    # Unchanged file: the cached bytes are served without reading it again.
+    r = await jp_fetch("custom", "custom.css")
+    assert r.body == b"body { color: red; }"
+    assert len(reads) == 1
+
+    # An edit within the same timestamp tick is still picked up.
+    st = custom_css.stat()
+    custom_css.write_text("body { color: blue; }")
+    os.utime(custom_css, ns=(st.st_atime_ns, st.st_mtime_ns))
+    r = await jp_fetch("custom", "custom.css")
+    assert r.body == b"body { color: blue; }"
+
+    # So is an edit that only changes the mtime.
+    custom_css.write_text("body { color: pink; }")
+    os.utime(custom_css, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    r = await jp_fetch("custom", "custom.css")
+    assert r.body == b"body { color: pink; }"
+
+
+async def test_custom_css_handler_fallback(improvements_app, tmp_path, jp_fetch):
+    improvements_app.static_dir = str(tmp_path / "share" / "static")
+    bundled_css = tmp_path / "share" / "custom" / "custom.css"
+    bundled_css.parent.mkdir(parents=True)
+    bundled_css.write_text("/* bundled */")
+
+    r = await jp_fetch("custom", "custom.css")
+    assert r.code == 200
+    assert r.body == b"/* bundled */"
+
+    bundled_css.unlink()
+    with pytest.raises(HTTPClientError) as e:
+        await jp_fetch("custom", "custom.css")
+    assert e.value.code == 500
+
+
+async def get_redirect(jp_fetch, *parts):
+    with pytest.raises(HTTPClientError) as e:
+        await jp_fetch(*parts, follow_redirects=False)
+    assert e.value.code == 302
+    return e.value.response.headers["Location"]
+
+
+async def test_tree_handler(improvements_app, notebooks, jp_root_dir, jp_fetch):
+    r = await jp_fetch("tree", "jlab_test_notebooks")
+    assert r.code == 200
+    html = r.body.decode()
+    assert "<title>Home</title>" in html
+    assert get_page_config(html)["treePath"] == "jlab_test_notebooks"
+
+    location = await get_redirect(jp_fetch, "tree", "notebook1.ipynb")
+    assert location == "/a%40b/notebooks/notebook1.ipynb"
+
+    (jp_root_dir / "foo.txt").write_text("hello")
+    location = await get_redirect(jp_fetch, "tree", "foo.txt")
+    assert location == "/a%40b/files/foo.txt"
+
+    with pytest.raises(HTTPClientError) as e:
+        await jp_fetch("tree", "does_not_exist.ipynb")
+    assert e.value.code == 404
+
+    (jp_root_dir / ".hidden").mkdir()
+    with pytest.raises(HTTPClientError) as e:
+        await jp_fetch("tree", ".hidden")
+    assert e.value.code == 404
+
+
+async def test_server_root_normalized_once(improvements_app, improvements, monkeypatch, jp_fetch):
+    calls = []
+    normalize = improvements._normalize_server_root
+
+    def counting_normalize(server_root):
+        calls.append(server_root)
+        return normalize(server_root)
+
+    monkeypatch.setattr(improvements, "_normalize_server_root", counting_normalize)
+    for _ in range(3):
+        await jp_fetch("notebooks", "foo")
+    assert len(calls) == 1
+    assert "_server_root_normalized" not in improvements_app.serverapp.web_app.settings
+
+
+async def test_preferred_path(improvements_app, jp_serverapp, jp_root_dir, monkeypatch, jp_fetch):
+    r = await jp_fetch("notebooks", "foo")
+    assert get_page_config(r.body.decode())["preferredPath"] == "/"
+
+    (jp_root_dir / "sub").mkdir()
+    jp_serverapp.preferred_dir = str(jp_root_dir / "sub")
+
+    calls = []
+    relpath = os.path.relpath
+
+    def counting_relpath(path, start=None):
+        if path == jp_serverapp.preferred_dir:
+            calls.append(path)
+        return relpath(path, start)
+
+    monkeypatch.setattr(os.path, "relpath", counting_relpath)
+
+    # A changed preferred_dir invalidates the cached value...
+    r = await jp_fetch("notebooks", "foo")
+    assert get_page_config(r.body.decode())["preferredPath"] == "/sub"
+    assert len(calls) == 1
+
+    # ...which is then reused while it stays the same.
+    r = await jp_fetch("notebooks", "foo")
+    assert get_page_config(r.body.decode())["preferredPath"] == "/sub"
+    assert len(calls) == 1
+
+
+def test_app_dir(improvements, tmp_path):
+    from jupyterlab.commands import get_app_dir
+
+    app = improvements.JupyterNotebookApp()
+    assert app.app_dir == pathlib.Path(get_app_dir())
+    assert improvements.app_dir == pathlib.Path(get_app_dir())
+
+    app = improvements.JupyterNotebookApp(app_dir=tmp_path)
+    assert app.app_dir == tmp_path